@@ -1,10 +1,14 @@
+import logging
 import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from typing import Tuple, Optional
+from pathlib import Path
 import numpy as np
 
+from data_schema import read_csv_data, write_parquet, parquet_is_current
+
 # ============================================================================
 # PAGE CONFIGURATION
 # ============================================================================
@@ -114,8 +118,28 @@ def load_data() -> Tuple[pd.DataFrame, pd.DataFrame]:
         Tuple of (matches, deliveries) DataFrames
     """
     try:
-        matches = pd.read_csv("data/matches.csv")
-        deliveries = pd.read_csv("data/deliveries.csv")
+        data_dir = Path("data")
+        parquet_paths = {name: data_dir / f"{name}.parquet" for name in ['matches', 'deliveries']}
+        
+        # Prefer the Parquet copies (see scripts/convert_to_parquet.py), which
+        # already carry the column dtypes, as long as they were written under
+        # the current column spec and are newer than their CSVs; otherwise
+        # parse the CSVs
+        if all(parquet_is_current(path, data_dir / f"{name}.csv") for name, path in parquet_paths.items()):
+            matches = pd.read_parquet(parquet_paths['matches'], engine='pyarrow')
+            deliveries = pd.read_parquet(parquet_paths['deliveries'], engine='pyarrow')
+        else:
+            matches, deliveries = read_csv_data(data_dir)
+            
+            # Write the Parquet copies so the next cold start skips CSV parsing.
+            # Best effort: the CSV load already succeeded, so any failure here
+            # (read-only data directory, full disk, Arrow conversion errors)
+            # just means the next start parses the CSVs again
+            try:
+                write_parquet(matches, parquet_paths['matches'])
+                write_parquet(deliveries, parquet_paths['deliveries'])
+            except Exception as e:
+                logging.warning("Could not write Parquet copies of the data, using the CSVs: %s", e)
         
         # Team name normalization
         team_mapping = {
@@ -123,23 +147,60 @@ def load_data() -> Tuple[pd.DataFrame, pd.DataFrame]:
             'Delhi Daredevils': 'Delhi Capitals',
         }
         
-        # Apply team mapping to matches
-        for col in ['team1', 'team2', 'winner', 'toss_winner']:
-            if col in matches.columns:
-                matches[col] = matches[col].replace(team_mapping)
+        # Store team columns as categoricals sharing one dtype, so they can be
+        # compared with each other (e.g. toss winner vs winner). The mapping is
+        # applied to the category labels, not to every row.
+        match_team_cols = ['team1', 'team2', 'winner', 'toss_winner']
+        delivery_team_cols = ['batting_team', 'bowling_team']
+        for col in match_team_cols:
+            matches[col] = matches[col].astype('category')
+        
+        team_names = {
+            team_mapping.get(name, name)
+            for df, cols in [(matches, match_team_cols), (deliveries, delivery_team_cols)]
+            for col in cols
+            for name in df[col].cat.categories
+        }
+        team_dtype = pd.CategoricalDtype(sorted(team_names))
+        
+        for col in match_team_cols:
+            matches[col] = recode_categories(matches[col], team_mapping, team_dtype)
+        for col in delivery_team_cols:
+            deliveries[col] = recode_categories(deliveries[col], team_mapping, team_dtype)
+        
+        for col in ['venue', 'city', 'toss_decision']:
+            matches[col] = matches[col].astype('category')
         
-        # Apply team mapping to deliveries
-        for col in ['batting_team', 'bowling_team']:
-            if col in deliveries.columns:
-                deliveries[col] = deliveries[col].replace(team_mapping)
+        # Both the CSV and Parquet reads yield sorted batsman categories, which the
+        # per-batsman tables (and so the player selectbox) rely on for name order
+        assert deliveries['batsman'].cat.categories.is_monotonic_increasing
         
-        # Convert date to datetime
-        if 'date' in matches.columns:
-            matches['date'] = pd.to_datetime(matches['date'], errors='coerce')
+        # Ordered season categorical: the categories double as the sorted season list
+        matches['season'] = pd.Categorical(
+            matches['season'], categories=sorted(matches['season'].unique()), ordered=True
+        )
         
         # Sort by date
         matches = matches.sort_values('date', ascending=False)
         
+        # apply_filters slices deliveries by match id and returns them whole when
+        # no filter applies, so match ids must be unique and every delivery must
+        # belong to a known match
+        if not matches['id'].is_unique:
+            raise ValueError("matches.csv contains duplicate match ids")
+        deliveries = deliveries[deliveries['match_id'].isin(matches['id'])]
+        
+        # Index deliveries by match id (sorted) so filtering is an index lookup;
+        # the index is left unnamed so 'match_id' still resolves to the column
+        deliveries = deliveries.sort_values('match_id', kind='stable').set_index('match_id', drop=False).rename_axis(None)
+        
+        # Six/four/wicket flags (plus wickets credited to the bowler), computed once
+        # and summed or masked on directly by the aggregations
+        deliveries['is_six'] = (deliveries['batsman_runs'] == 6).astype('int8')
+        deliveries['is_four'] = (deliveries['batsman_runs'] == 4).astype('int8')
+        deliveries['is_wicket'] = deliveries['player_dismissed'].notna().astype('int8')
+        deliveries['is_bowler_wicket'] = deliveries['dismissal_kind'].isin(get_valid_dismissals()).astype('int8')
+        
         return matches, deliveries
         
     except FileNotFoundError as e:
@@ -164,6 +225,25 @@ def create_metric_card(value: any, label: str) -> str:
         </div>
     '''
 
+def recode_categories(series: pd.Series, mapping: dict, dtype: pd.CategoricalDtype) -> pd.Series:
+    """
+    Rename the categories of a categorical column and recode it onto `dtype`.
+    
+    Only the category labels go through `mapping`; rows are moved to the new
+    codes with an integer lookup, so labels that merge (e.g. two spellings
+    of one team) collapse into a single category.
+    """
+    renamed = series.cat.categories.map(lambda name: mapping.get(name, name))
+    # Trailing -1 keeps missing values (code -1) missing
+    lookup = np.append(dtype.categories.get_indexer(renamed), -1)
+    codes = lookup[series.cat.codes.to_numpy()]
+    return pd.Series(pd.Categorical.from_codes(codes, dtype=dtype), index=series.index, name=series.name)
+
+def count_values(series: pd.Series) -> pd.Series:
+    """value_counts() without the zero counts reported for unused categories."""
+    counts = series.value_counts()
+    return counts[counts > 0]
+
 def get_valid_dismissals() -> list:
     """Return list of valid dismissal types that count toward bowler."""
     return ['caught', 'bowled', 'lbw', 'caught and bowled', 'stumped', 'hit wicket']
@@ -177,6 +257,722 @@ def calculate_economy(runs: int, balls: int) -> float:
     overs = balls / 6
     return (runs / overs) if overs > 0 else 0
 
+def aggregate_by_over(over: np.ndarray, total_runs: np.ndarray, is_wicket: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Sum runs, wickets and balls per over number.
+    
+    Each total is a single bincount pass over the delivery arrays. Results are
+    indexed by over number, so overs with no deliveries hold zero.
+    
+    Returns:
+        Tuple of (runs, wickets, balls) int64 arrays
+    """
+    balls = np.bincount(over)
+    runs = np.bincount(over, weights=total_runs, minlength=len(balls)).astype(np.int64)
+    wickets = np.bincount(over, weights=is_wicket, minlength=len(balls)).astype(np.int64)
+    return runs, wickets, balls.astype(np.int64)
+
+# ============================================================================
+# CACHED FILTERING & AGGREGATIONS
+# ============================================================================
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def compute_filter_options() -> Tuple[list, list, list]:
+    """
+    Sorted sidebar options derived from the full matches table.
+    
+    Returns:
+        Tuple of (seasons newest first, teams, venues)
+    """
+    matches, _ = load_data()
+    return (
+        matches['season'].cat.categories[::-1].tolist(),
+        # The categories are already sorted; keep only those in use
+        matches['team1'].cat.remove_unused_categories().cat.categories.tolist(),
+        matches['venue'].cat.remove_unused_categories().cat.categories.tolist(),
+    )
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def match_to_season() -> pd.Series:
+    """Season of every match, indexed by match id."""
+    matches, _ = load_data()
+    return matches.set_index('id')['season']
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def match_to_venue() -> pd.Series:
+    """Venue of every match, indexed by match id."""
+    matches, _ = load_data()
+    return matches.set_index('id')['venue']
+
+@st.cache_data(ttl=3600, max_entries=32, show_spinner=False)
+def apply_filters(seasons: tuple, teams: tuple, venues: tuple) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Apply the sidebar selections to matches and deliveries.
+    
+    Selections are passed as tuples so they can be hashed as the cache key.
+    
+    Returns:
+        Tuple of (filtered_matches, filtered_deliveries) DataFrames
+    """
+    matches, deliveries = load_data()
+    
+    # Combine all filters into one mask and index once
+    mask = np.ones(len(matches), dtype=bool)
+    
+    if seasons:
+        mask &= matches['season'].isin(seasons).to_numpy()
+    
+    if teams:
+        mask &= (
+            (matches['team1'].isin(teams)) | 
+            (matches['team2'].isin(teams))
+        ).to_numpy()
+    
+    if venues:
+        mask &= matches['venue'].isin(venues).to_numpy()
+    
+    if mask.all():
+        return matches, deliveries
+    
+    filtered_matches = matches.loc[mask]
+    
+    # Deliveries are sorted by match id, so each match is one contiguous block:
+    # binary-search the block boundaries and take those rows by position
+    match_index = deliveries.index.to_numpy()
+    filtered_match_ids = np.sort(filtered_matches['id'].to_numpy())
+    starts = np.searchsorted(match_index, filtered_match_ids, side='left')
+    lengths = np.searchsorted(match_index, filtered_match_ids, side='right') - starts
+    offsets = np.cumsum(lengths) - lengths
+    positions = np.arange(lengths.sum()) + np.repeat(starts - offsets, lengths)
+    filtered_deliveries = deliveries.iloc[positions]
+    
+    return filtered_matches, filtered_deliveries
+
+@st.cache_data(ttl=3600, max_entries=32, show_spinner=False)
+def compute_kpis(filter_key: tuple) -> Tuple[int, int, int, int, int]:
+    """
+    Headline metrics for a filter selection.
+    
+    Returns:
+        Tuple of (matches, runs, wickets, sixes, fours)
+    """
+    filtered_matches, filtered_deliveries = apply_filters(*filter_key)
+    # One column-wise reduction over the int8 columns instead of four separate sums
+    totals = filtered_deliveries[['total_runs', 'is_wicket', 'is_six', 'is_four']].to_numpy().sum(axis=0, dtype=np.int64)
+    runs, wickets, sixes, fours = (int(total) for total in totals)
+    return filtered_matches.shape[0], runs, wickets, sixes, fours
+
+@st.cache_data(ttl=3600, max_entries=32, show_spinner=False)
+def compute_team_records(filter_key: tuple) -> pd.DataFrame:
+    """
+    Matches played, wins and win percentage for every team in a filter selection.
+    
+    Returns:
+        DataFrame indexed by 'Team' with 'Matches', 'Wins' and 'Win %' columns
+    """
+    filtered_matches, _ = apply_filters(*filter_key)
+    
+    # The team columns share one categorical dtype, so their codes index the
+    # same team list and can be counted with bincount. Missing values have code
+    # -1 and are skipped, as value_counts would.
+    teams = filtered_matches['team1'].cat.categories
+    
+    team1_codes = filtered_matches['team1'].cat.codes.to_numpy()
+    team2_codes = filtered_matches['team2'].cat.codes.to_numpy()
+    winner_codes = filtered_matches['winner'].cat.codes.to_numpy()
+    
+    appearances = (
+        np.bincount(team1_codes[team1_codes >= 0], minlength=len(teams))
+        + np.bincount(team2_codes[team2_codes >= 0], minlength=len(teams))
+    )
+    wins = np.bincount(winner_codes[winner_codes >= 0], minlength=len(teams))
+    
+    played = appearances > 0
+    records = pd.DataFrame(
+        {'Matches': appearances[played], 'Wins': wins[played]},
+        index=pd.Index(teams[played], name='Team'),
+    )
+    records['Win %'] = records['Wins'] / records['Matches'] * 100
+    return records
+
+@st.cache_data(ttl=3600, max_entries=32, show_spinner=False)
+def compute_h2h_crosstab(filter_key: tuple) -> pd.DataFrame:
+    """Winner-by-loser match counts for a filter selection (empty if no decided matches)."""
+    filtered_matches, _ = apply_filters(*filter_key)
+    
+    # The loser is whichever side of the fixture did not win
+    winners = filtered_matches['winner'].to_numpy()
+    team1s = filtered_matches['team1'].to_numpy()
+    team2s = filtered_matches['team2'].to_numpy()
+    losers = np.where(team1s == winners, team2s, team1s)
+    decided = pd.notna(winners) & pd.notna(losers)
+    
+    if not decided.any():
+        return pd.DataFrame()
+    return pd.crosstab(
+        pd.Series(winners[decided], name='Winner'),
+        pd.Series(losers[decided], name='Loser')
+    )
+
+@st.cache_data(ttl=3600, max_entries=32, show_spinner=False)
+def compute_venue_avg(filter_key: tuple) -> pd.DataFrame:
+    """Top 15 venues by average first innings score for a filter selection."""
+    _, filtered_deliveries = apply_filters(*filter_key)
+    first_innings = filtered_deliveries[filtered_deliveries['inning'] == 1]
+    match_scores = first_innings.groupby('match_id')['total_runs'].sum()
+    venues = match_scores.index.map(match_to_venue())
+    return match_scores.groupby(venues, observed=True).mean().nlargest(15).rename_axis('Venue').reset_index(name='Avg Score')
+
+@st.cache_data(ttl=3600, max_entries=32, show_spinner=False)
+def compute_dismissal_counts(filter_key: tuple) -> pd.DataFrame:
+    """Count of each dismissal type for a filter selection."""
+    _, filtered_deliveries = apply_filters(*filter_key)
+    return count_values(filtered_deliveries['dismissal_kind']).rename_axis('Dismissal Type').reset_index(name='Count')
+
+@st.cache_data(ttl=3600, max_entries=32, show_spinner=False)
+def compute_match_aggregates(filter_key: tuple) -> dict:
+    """
+    Build the match-level count tables behind Tabs 1 and 3 for a filter selection.
+    
+    Returns:
+        Dict of ready-to-plot DataFrames keyed by chart name
+    """
+    filtered_matches, _ = apply_filters(*filter_key)
+    
+    matches_per_season = count_values(filtered_matches['season']).sort_index().rename_axis('Season').reset_index(name='Matches')
+    wins_by_team = count_values(filtered_matches['winner']).rename_axis('Team').reset_index(name='Wins').head(10)
+    toss_counts = count_values(filtered_matches['toss_decision']).rename_axis('Decision').reset_index(name='Count')
+    venue_matches = count_values(filtered_matches['venue']).head(15).rename_axis('Venue').reset_index(name='Matches')
+    
+    win_by_runs = filtered_matches['win_by_runs'].to_numpy()
+    win_by_wickets = filtered_matches['win_by_wickets'].to_numpy()
+    win_types = pd.Series(np.select(
+        [win_by_runs > 0, win_by_wickets > 0],
+        ['Won Batting First', 'Won Chasing'],
+        default='Tie/No Result'
+    ))
+    win_type_counts = win_types.value_counts().rename_axis('Type').reset_index(name='Count')
+    
+    return {
+        'matches_per_season': matches_per_season,
+        'wins_by_team': wins_by_team,
+        'toss_counts': toss_counts,
+        'win_type_counts': win_type_counts,
+        'venue_matches': venue_matches,
+    }
+
+@st.cache_data(ttl=3600, max_entries=32, show_spinner=False)
+def compute_delivery_aggregates(filter_key: tuple) -> dict:
+    """
+    Build every Player and Over tab table (and the run rate progression) for a
+    filter selection in one go.
+    
+    The filtered deliveries are fetched once and all batsman figures come from
+    a single groupby, so the leaderboards share the same pass over the data.
+    
+    Returns:
+        Dict of ready-to-plot DataFrames keyed by chart name
+    """
+    _, filtered_deliveries = apply_filters(*filter_key)
+    
+    # One groupby over batsman feeds the leaderboards and the player deep dive
+    batsman_stats = filtered_deliveries.groupby('batsman', observed=True).agg(
+        runs=('batsman_runs', 'sum'),
+        balls=('batsman_runs', 'size'),
+        innings=('match_id', 'nunique'),
+        sixes=('is_six', 'sum'),
+        fours=('is_four', 'sum'),
+    )
+    
+    # Player tab leaderboards
+    top_scorers = batsman_stats['runs'].nlargest(10).rename_axis('Batsman').reset_index(name='Runs')
+    
+    # Unsorted per-bowler counts; nlargest only orders the top 10
+    bowler_wicket = filtered_deliveries['is_bowler_wicket'].to_numpy().astype(bool)
+    wickets_by_bowler = filtered_deliveries.loc[bowler_wicket, 'bowler'].value_counts(sort=False)
+    top_wicket_takers = wickets_by_bowler[wickets_by_bowler > 0].nlargest(10).rename_axis('Bowler').reset_index(name='Wickets')
+    
+    six_hitters = batsman_stats.loc[batsman_stats['sixes'] > 0, 'sixes'].nlargest(10).rename_axis('Batsman').reset_index(name='Sixes')
+    
+    four_hitters = batsman_stats.loc[batsman_stats['fours'] > 0, 'fours'].nlargest(10).rename_axis('Batsman').reset_index(name='Fours')
+    
+    # Over tab: scoring per over and per match phase
+    runs_by_over, wickets_by_over, balls_by_over = aggregate_by_over(
+        filtered_deliveries['over'].to_numpy(),
+        filtered_deliveries['total_runs'].to_numpy(),
+        filtered_deliveries['is_wicket'].to_numpy(),
+    )
+    
+    overs_played = np.flatnonzero(balls_by_over)
+    over_stats = pd.DataFrame({
+        'Over': overs_played,
+        'Total Runs': runs_by_over[overs_played],
+        'Wickets': wickets_by_over[overs_played],
+        'Balls': balls_by_over[overs_played],
+    })
+    
+    # Calculate average runs per over
+    over_stats['Avg Runs per Ball'] = over_stats['Total Runs'] / over_stats['Balls']
+    
+    # Cumulative run rate after each over, from the same per-over bins
+    over_cumulative = pd.DataFrame({
+        'over': overs_played,
+        'Run Rate': np.cumsum(over_stats['Total Runs'].to_numpy()) / np.cumsum(over_stats['Balls'].to_numpy()) * 6,
+    })
+    
+    # Fold the per-over bins into the three match phases (edges at overs 6 and 15)
+    phase_labels = ['Powerplay (1-6)', 'Middle (7-15)', 'Death (16-20)']
+    phase_of_over = np.digitize(np.arange(len(balls_by_over)), [6, 15])
+    
+    phase_stats = pd.DataFrame({
+        'Phase': phase_labels,
+        'total_runs': np.bincount(phase_of_over, weights=runs_by_over, minlength=3).astype(np.int64),
+        'player_dismissed': np.bincount(phase_of_over, weights=wickets_by_over, minlength=3).astype(np.int64),
+        'ball': np.bincount(phase_of_over, weights=balls_by_over, minlength=3).astype(np.int64),
+    })
+    phase_stats = phase_stats[phase_stats['ball'] > 0].reset_index(drop=True)
+    
+    phase_stats['Economy'] = (phase_stats['total_runs'] / (phase_stats['ball'] / 6)).round(2)
+    
+    return {
+        'batsman_stats': batsman_stats,
+        'top_scorers': top_scorers,
+        'top_wicket_takers': top_wicket_takers,
+        'six_hitters': six_hitters,
+        'four_hitters': four_hitters,
+        'over_stats': over_stats,
+        'over_cumulative': over_cumulative,
+        'phase_stats': phase_stats,
+    }
+
+@st.cache_data(ttl=3600, max_entries=32, show_spinner=False)
+def compute_player_breakdown(filter_key: tuple, player: str) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Run distribution and runs per season for one batsman in a filter selection.
+    
+    Returns:
+        Tuple of (run_counts, player_season_runs) DataFrames
+    """
+    _, filtered_deliveries = apply_filters(*filter_key)
+    
+    # Compare category codes rather than player name strings
+    batsman = filtered_deliveries['batsman']
+    player_mask = batsman.cat.codes.to_numpy() == batsman.cat.categories.get_loc(player)
+    player_df = filtered_deliveries[player_mask]
+    
+    run_counts = player_df['batsman_runs'].value_counts().sort_index().rename_axis('Runs').reset_index(name='Frequency')
+    
+    player_seasons = player_df['match_id'].map(match_to_season())
+    player_season_runs = player_df.groupby(player_seasons, observed=True)['batsman_runs'].sum().rename_axis('Season').reset_index(name='Runs')
+    
+    return run_counts, player_season_runs
+
+# ============================================================================
+# CHART BUILDERS
+# ============================================================================
+
+# Shared layout for the horizontal bar (leaderboard) charts
+BASE_LAYOUT = dict(
+    showlegend=False,
+    yaxis={'categoryorder': 'total ascending'},
+    plot_bgcolor='rgba(0,0,0,0)',
+    paper_bgcolor='rgba(0,0,0,0)',
+)
+
+def hbar(df: pd.DataFrame, x: str, y: str, cscale: str, **kwargs) -> go.Figure:
+    """Horizontal bar chart coloured by its value column, largest bar on top."""
+    fig = px.bar(
+        df,
+        x=x,
+        y=y,
+        orientation='h',
+        template='plotly_dark',
+        color=x,
+        color_continuous_scale=cscale,
+        **kwargs,
+    )
+    fig.update_layout(**BASE_LAYOUT)
+    return fig
+
+def build_matches_per_season_fig(matches_per_season: pd.DataFrame) -> go.Figure:
+    """Bar chart of matches played per season."""
+    fig = px.bar(
+        matches_per_season,
+        x='Season',
+        y='Matches',
+        color='Matches',
+        template='plotly_dark',
+        color_continuous_scale='Reds',
+        labels={'Matches': 'Number of Matches'},
+    )
+    fig.update_layout(
+        showlegend=False,
+        hovermode='x unified',
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+    )
+    return fig
+
+def build_wins_by_team_fig(wins_by_team: pd.DataFrame) -> go.Figure:
+    """Horizontal bar chart of total wins by team."""
+    return hbar(wins_by_team, 'Wins', 'Team', 'Viridis', labels={'Wins': 'Number of Wins'})
+
+def build_toss_decision_fig(toss_counts: pd.DataFrame) -> go.Figure:
+    """Donut chart of toss decisions."""
+    fig = px.pie(
+        toss_counts,
+        names='Decision',
+        values='Count',
+        hole=0.4,
+        template='plotly_dark',
+        color_discrete_sequence=px.colors.sequential.RdBu,
+    )
+    fig.update_traces(textposition='inside', textinfo='percent+label')
+    fig.update_layout(
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+    )
+    return fig
+
+def build_win_type_fig(win_type_counts: pd.DataFrame) -> go.Figure:
+    """Pie chart of match result types."""
+    fig = px.pie(
+        win_type_counts,
+        names='Type',
+        values='Count',
+        color_discrete_sequence=['#ff9f43', '#0abde3', '#576574'],
+        template='plotly_dark',
+    )
+    fig.update_traces(textposition='inside', textinfo='percent+label')
+    fig.update_layout(
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+    )
+    return fig
+
+@st.cache_resource(ttl=3600, max_entries=32, show_spinner=False)
+def build_title_winners_fig(title_counts: pd.DataFrame) -> go.Figure:
+    """Bar chart of titles per team."""
+    fig = px.bar(
+        title_counts,
+        x='Team',
+        y='Titles',
+        template='plotly_dark',
+        color='Titles',
+        color_continuous_scale='YlOrRd',
+    )
+    fig.update_layout(
+        showlegend=False,
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+    )
+    return fig
+
+@st.cache_resource(ttl=3600, max_entries=32, show_spinner=False)
+def build_win_pct_fig(team_stats_df: pd.DataFrame) -> go.Figure:
+    """Horizontal bar chart of team win percentages."""
+    return hbar(team_stats_df, 'Win %', 'Team', 'Greens', hover_data=['Matches'])
+
+@st.cache_resource(ttl=3600, max_entries=32, show_spinner=False)
+def build_top_scorers_fig(top_scorers: pd.DataFrame) -> go.Figure:
+    """Horizontal bar chart of the top run scorers."""
+    return hbar(top_scorers, 'Runs', 'Batsman', 'Sunsetdark')
+
+@st.cache_resource(ttl=3600, max_entries=32, show_spinner=False)
+def build_top_wicket_takers_fig(top_wicket_takers: pd.DataFrame) -> go.Figure:
+    """Horizontal bar chart of the top wicket takers."""
+    return hbar(top_wicket_takers, 'Wickets', 'Bowler', 'Teal')
+
+@st.cache_resource(ttl=3600, max_entries=32, show_spinner=False)
+def build_six_hitters_fig(six_hitters: pd.DataFrame) -> go.Figure:
+    """Horizontal bar chart of the most sixes."""
+    return hbar(six_hitters, 'Sixes', 'Batsman', 'Oranges')
+
+@st.cache_resource(ttl=3600, max_entries=32, show_spinner=False)
+def build_four_hitters_fig(four_hitters: pd.DataFrame) -> go.Figure:
+    """Horizontal bar chart of the most fours."""
+    return hbar(four_hitters, 'Fours', 'Batsman', 'Blues')
+
+@st.cache_resource(ttl=3600, max_entries=32, show_spinner=False)
+def build_player_runs_dist_fig(run_counts: pd.DataFrame, selected_player: str) -> go.Figure:
+    """Bar chart of a player's runs-per-ball distribution."""
+    fig = px.bar(
+        run_counts,
+        x='Runs',
+        y='Frequency',
+        title=f"Run Distribution - {selected_player}",
+        template='plotly_dark',
+        color='Frequency',
+        color_continuous_scale='Plasma',
+    )
+    fig.update_layout(
+        showlegend=False,
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+    )
+    return fig
+
+@st.cache_resource(ttl=3600, max_entries=32, show_spinner=False)
+def build_player_season_runs_fig(player_season_runs: pd.DataFrame, selected_player: str) -> go.Figure:
+    """Line chart of a player's runs per season."""
+    fig = px.line(
+        player_season_runs,
+        x='Season',
+        y='Runs',
+        title=f"Runs Per Season - {selected_player}",
+        template='plotly_dark',
+        markers=True,
+    )
+    fig.update_traces(line_color='#ff4b4b', marker=dict(size=8))
+    fig.update_layout(
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+    )
+    return fig
+
+def build_venue_matches_fig(venue_matches: pd.DataFrame) -> go.Figure:
+    """Horizontal bar chart of the most hosted venues."""
+    return hbar(venue_matches, 'Matches', 'Venue', 'Viridis')
+
+def build_venue_avg_score_fig(avg_scores: pd.DataFrame) -> go.Figure:
+    """Horizontal bar chart of average first innings score by venue."""
+    return hbar(avg_scores, 'Avg Score', 'Venue', 'Reds')
+
+@st.cache_resource(ttl=3600, max_entries=32, show_spinner=False)
+def build_toss_impact_fig(toss_impact: pd.DataFrame) -> go.Figure:
+    """Donut chart of results for toss winners."""
+    fig = px.pie(
+        toss_impact,
+        names='Outcome',
+        values='Count',
+        template='plotly_dark',
+        color_discrete_sequence=['#2ecc71', '#e74c3c'],
+        hole=0.4,
+    )
+    fig.update_traces(textposition='inside', textinfo='percent+label')
+    fig.update_layout(
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+    )
+    return fig
+
+@st.cache_resource(ttl=3600, max_entries=32, show_spinner=False)
+def build_over_runs_fig(over_stats: pd.DataFrame) -> go.Figure:
+    """Line chart of total runs per over."""
+    fig = px.line(
+        over_stats,
+        x='Over',
+        y='Total Runs',
+        title="Total Runs Scored per Over",
+        markers=True,
+        template='plotly_dark',
+    )
+    fig.update_traces(line_color='#ff4b4b', marker=dict(size=6))
+    fig.update_layout(
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+    )
+    return fig
+
+@st.cache_resource(ttl=3600, max_entries=32, show_spinner=False)
+def build_over_wickets_fig(over_stats: pd.DataFrame) -> go.Figure:
+    """Bar chart of total wickets per over."""
+    fig = px.bar(
+        over_stats,
+        x='Over',
+        y='Wickets',
+        title="Total Wickets per Over",
+        template='plotly_dark',
+        color='Wickets',
+        color_continuous_scale='Teal',
+    )
+    fig.update_layout(
+        showlegend=False,
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+    )
+    return fig
+
+@st.cache_resource(ttl=3600, max_entries=32, show_spinner=False)
+def build_phase_runs_fig(phase_stats: pd.DataFrame) -> go.Figure:
+    """Bar chart of runs by match phase."""
+    fig = px.bar(
+        phase_stats,
+        x='Phase',
+        y='total_runs',
+        title="Runs by Match Phase",
+        template='plotly_dark',
+        color='total_runs',
+        color_continuous_scale='Reds',
+        labels={'total_runs': 'Total Runs'},
+    )
+    fig.update_layout(
+        showlegend=False,
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+    )
+    return fig
+
+@st.cache_resource(ttl=3600, max_entries=32, show_spinner=False)
+def build_phase_economy_fig(phase_stats: pd.DataFrame) -> go.Figure:
+    """Bar chart of economy rate by match phase."""
+    fig = px.bar(
+        phase_stats,
+        x='Phase',
+        y='Economy',
+        title="Economy Rate by Phase",
+        template='plotly_dark',
+        color='Economy',
+        color_continuous_scale='Greens',
+    )
+    fig.update_layout(
+        showlegend=False,
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+    )
+    return fig
+
+def build_h2h_heatmap_fig(heatmap_data: pd.DataFrame) -> go.Figure:
+    """Heatmap of team-vs-team wins, labelling only the non-empty cells."""
+    wins = heatmap_data.to_numpy()
+    fig = go.Figure(go.Heatmap(
+        z=wins,
+        x=heatmap_data.columns.astype(str),
+        y=heatmap_data.index.astype(str),
+        text=np.where(wins > 0, wins.astype(str), ''),
+        texttemplate='%{text}',
+        colorscale='Viridis',
+        colorbar={'title': {'text': 'Wins'}},
+        hovertemplate='Won By: %{y}<br>Lost Against: %{x}<br>Wins: %{z}<extra></extra>',
+    ))
+    fig.update_layout(
+        title="Team vs Team Win Matrix",
+        template='plotly_dark',
+        xaxis_title='Lost Against',
+        yaxis_title='Won By',
+        yaxis_autorange='reversed',
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+    )
+    return fig
+
+@st.cache_resource(ttl=3600, max_entries=32, show_spinner=False)
+def build_h2h_fig(h2h_data: pd.DataFrame, team1: str, team2: str) -> go.Figure:
+    """Bar chart of head-to-head wins between two teams."""
+    fig = px.bar(
+        h2h_data,
+        x='Team',
+        y='Wins',
+        template='plotly_dark',
+        color='Team',
+        color_discrete_sequence=['#ff4b4b', '#0abde3'],
+    )
+    fig.update_layout(
+        title=f"{team1} vs {team2} - Head to Head",
+        showlegend=False,
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+    )
+    return fig
+
+@st.cache_resource(ttl=3600, max_entries=32, show_spinner=False)
+def build_consistency_fig(consistency_df: pd.DataFrame) -> go.Figure:
+    """Scatter plot of win percentage against matches played."""
+    fig = px.scatter(
+        consistency_df,
+        x='Matches',
+        y='Win %',
+        size='Wins',
+        color='Win %',
+        hover_name='Team',
+        template='plotly_dark',
+        color_continuous_scale='RdYlGn',
+        size_max=30,
+    )
+    fig.update_layout(
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+    )
+    return fig
+
+@st.cache_resource(ttl=3600, max_entries=32, show_spinner=False)
+def build_dismissals_fig(dismissal_counts: pd.DataFrame) -> go.Figure:
+    """Donut chart of dismissal types."""
+    fig = px.pie(
+        dismissal_counts,
+        names='Dismissal Type',
+        values='Count',
+        template='plotly_dark',
+        hole=0.3,
+    )
+    fig.update_traces(textposition='inside', textinfo='percent+label')
+    fig.update_layout(
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+    )
+    return fig
+
+@st.cache_resource(ttl=3600, max_entries=32, show_spinner=False)
+def build_extras_fig(extras_df: pd.DataFrame) -> go.Figure:
+    """Bar chart of extras by type."""
+    fig = px.bar(
+        extras_df,
+        x='Type',
+        y='Count',
+        template='plotly_dark',
+        color='Count',
+        color_continuous_scale='Reds',
+    )
+    fig.update_layout(
+        showlegend=False,
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+    )
+    return fig
+
+@st.cache_resource(ttl=3600, max_entries=32, show_spinner=False)
+def build_run_rate_fig(over_cumulative: pd.DataFrame) -> go.Figure:
+    """Line chart of the cumulative run rate by over."""
+    fig = px.line(
+        over_cumulative,
+        x='over',
+        y='Run Rate',
+        title="Cumulative Run Rate by Over",
+        template='plotly_dark',
+        markers=True,
+    )
+    fig.update_traces(line_color='#2ecc71')
+    fig.update_layout(
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+    )
+    return fig
+
+@st.cache_resource(ttl=3600, max_entries=32, show_spinner=False)
+def build_filter_figs(filter_key: tuple) -> dict:
+    """
+    Figures that depend only on the filter selection.
+    
+    Keyed by the filter tuple rather than by the chart data, so an unchanged
+    selection skips both hashing the data and rebuilding the figures. This is
+    the only caching layer for these figures: their builders are not cached.
+    
+    Returns:
+        Dict of figures keyed by chart name (the heatmap is None without decided matches)
+    """
+    match_aggregates = compute_match_aggregates(filter_key)
+    heatmap_data = compute_h2h_crosstab(filter_key)
+    
+    return {
+        'matches_per_season': build_matches_per_season_fig(match_aggregates['matches_per_season']),
+        'wins_by_team': build_wins_by_team_fig(match_aggregates['wins_by_team']),
+        'toss_decision': build_toss_decision_fig(match_aggregates['toss_counts']),
+        'win_type': build_win_type_fig(match_aggregates['win_type_counts']),
+        'venue_matches': build_venue_matches_fig(match_aggregates['venue_matches']),
+        'venue_avg_score': build_venue_avg_score_fig(compute_venue_avg(filter_key)),
+        'h2h_heatmap': None if heatmap_data.empty else build_h2h_heatmap_fig(heatmap_data),
+    }
+
 # ============================================================================
 # LOAD DATA
 # ============================================================================
@@ -195,8 +991,9 @@ st.sidebar.image(
 
 st.sidebar.markdown("---")
 
+seasons, teams, venues = compute_filter_options()
+
 # Season Filter
-seasons = sorted(matches['season'].unique(), reverse=True)
 selected_season = st.sidebar.multiselect(
     "🗓️ Select Season(s)",
     seasons,
@@ -205,7 +1002,6 @@ selected_season = st.sidebar.multiselect(
 )
 
 # Team Filter
-teams = sorted(matches['team1'].dropna().unique())
 selected_teams = st.sidebar.multiselect(
     "🏏 Select Team(s)",
     teams,
@@ -214,7 +1010,6 @@ selected_teams = st.sidebar.multiselect(
 )
 
 # Venue Filter
-venues = sorted(matches['venue'].dropna().unique())
 selected_venues = st.sidebar.multiselect(
     "📍 Select Venue(s)",
     venues,
@@ -228,23 +1023,16 @@ st.sidebar.info("💡 **Tip:** Use filters to narrow down your analysis")
 # APPLY FILTERS
 # ============================================================================
 
-filtered_matches = matches.copy()
+# Multiselects return values in click order; sort so the same selection
+# always maps to the same cache key
+filter_key = (tuple(sorted(selected_season)), tuple(sorted(selected_teams)), tuple(sorted(selected_venues)))
+filtered_matches, filtered_deliveries = apply_filters(*filter_key)
 
-if selected_season:
-    filtered_matches = filtered_matches[filtered_matches['season'].isin(selected_season)]
+# Player and Over tab tables, computed together and cached per filter selection
+delivery_aggregates = compute_delivery_aggregates(filter_key)
 
-if selected_teams:
-    filtered_matches = filtered_matches[
-        (filtered_matches['team1'].isin(selected_teams)) | 
-        (filtered_matches['team2'].isin(selected_teams))
-    ]
-
-if selected_venues:
-    filtered_matches = filtered_matches[filtered_matches['venue'].isin(selected_venues)]
-
-# Filter deliveries based on matches
-filtered_match_ids = filtered_matches['id'].unique()
-filtered_deliveries = deliveries[deliveries['match_id'].isin(filtered_match_ids)]
+# Figures that depend on nothing but the filter selection
+filter_figs = build_filter_figs(filter_key)
 
 # ============================================================================
 # HEADER
@@ -273,11 +1061,12 @@ st.divider()
 
 col1, col2, col3, col4, col5 = st.columns(5)
 
-total_matches = filtered_matches.shape[0]
-total_runs = int(filtered_deliveries['total_runs'].sum())
-total_wickets = int(filtered_deliveries['player_dismissed'].notna().sum())
-total_sixes = int(filtered_deliveries[filtered_deliveries['batsman_runs'] == 6].shape[0])
-total_fours = int(filtered_deliveries[filtered_deliveries['batsman_runs'] == 4].shape[0])
+# Headline numbers only change with the filters; keep them across other reruns
+if st.session_state.get('_kpi_key') != filter_key:
+    st.session_state['_kpi'] = compute_kpis(filter_key)
+    st.session_state['_kpi_key'] = filter_key
+
+total_matches, total_runs, total_wickets, total_sixes, total_fours = st.session_state['_kpi']
 
 with col1:
     st.markdown(create_metric_card(total_matches, "Total Matches"), unsafe_allow_html=True)
@@ -318,49 +1107,11 @@ with tab1:
     
     with col_a:
         st.subheader("📈 Matches Per Season")
-        matches_per_season = filtered_matches['season'].value_counts().sort_index().reset_index()
-        matches_per_season.columns = ['Season', 'Matches']
-        
-        fig_matches = px.bar(
-            matches_per_season,
-            x='Season',
-            y='Matches',
-            color='Matches',
-            template='plotly_dark',
-            color_continuous_scale='Reds',
-            labels={'Matches': 'Number of Matches'},
-        )
-        fig_matches.update_layout(
-            showlegend=False,
-            hovermode='x unified',
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
-        )
-        st.plotly_chart(fig_matches, use_container_width=True)
+        st.plotly_chart(filter_figs['matches_per_season'], use_container_width=True)
     
     with col_b:
         st.subheader("🏅 Total Wins by Team")
-        wins_by_team = filtered_matches['winner'].value_counts().reset_index()
-        wins_by_team.columns = ['Team', 'Wins']
-        wins_by_team = wins_by_team.head(10)
-        
-        fig_wins = px.bar(
-            wins_by_team,
-            x='Wins',
-            y='Team',
-            orientation='h',
-            template='plotly_dark',
-            color='Wins',
-            color_continuous_scale='Viridis',
-            labels={'Wins': 'Number of Wins'},
-        )
-        fig_wins.update_layout(
-            showlegend=False,
-            yaxis={'categoryorder': 'total ascending'},
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
-        )
-        st.plotly_chart(fig_wins, use_container_width=True)
+        st.plotly_chart(filter_figs['wins_by_team'], use_container_width=True)
 
     st.divider()
     
@@ -368,47 +1119,11 @@ with tab1:
     
     with col_c:
         st.subheader("🎲 Toss Decision Distribution")
-        toss_counts = filtered_matches['toss_decision'].value_counts().reset_index()
-        toss_counts.columns = ['Decision', 'Count']
-        
-        fig_toss = px.pie(
-            toss_counts,
-            names='Decision',
-            values='Count',
-            hole=0.4,
-            template='plotly_dark',
-            color_discrete_sequence=px.colors.sequential.RdBu,
-        )
-        fig_toss.update_traces(textposition='inside', textinfo='percent+label')
-        fig_toss.update_layout(
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
-        )
-        st.plotly_chart(fig_toss, use_container_width=True)
+        st.plotly_chart(filter_figs['toss_decision'], use_container_width=True)
         
     with col_d:
         st.subheader("🎯 Match Result Types")
-        win_types = filtered_matches.apply(
-            lambda x: 'Won Batting First' if x['win_by_runs'] > 0 
-            else ('Won Chasing' if x['win_by_wickets'] > 0 else 'Tie/No Result'),
-            axis=1
-        )
-        win_type_counts = win_types.value_counts().reset_index()
-        win_type_counts.columns = ['Type', 'Count']
-        
-        fig_win_type = px.pie(
-            win_type_counts,
-            names='Type',
-            values='Count',
-            color_discrete_sequence=['#ff9f43', '#0abde3', '#576574'],
-            template='plotly_dark',
-        )
-        fig_win_type.update_traces(textposition='inside', textinfo='percent+label')
-        fig_win_type.update_layout(
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
-        )
-        st.plotly_chart(fig_win_type, use_container_width=True)
+        st.plotly_chart(filter_figs['win_type'], use_container_width=True)
     
     st.divider()
     
@@ -419,58 +1134,17 @@ with tab1:
         st.subheader("🏆 Title Winners")
         if 'season' in filtered_matches.columns:
             # Group by season and get the winner (team with most titles in selected seasons)
-            season_winners = filtered_matches.groupby(['season', 'winner']).size().reset_index(name='wins')
-            season_winners = season_winners.loc[season_winners.groupby('season')['wins'].idxmax()]
-            title_counts = season_winners['winner'].value_counts().reset_index()
-            title_counts.columns = ['Team', 'Titles']
+            season_winners = filtered_matches.groupby(['season', 'winner'], observed=True).size().reset_index(name='wins')
+            season_winners = season_winners.loc[season_winners.groupby('season', observed=True)['wins'].idxmax()]
+            title_counts = count_values(season_winners['winner']).rename_axis('Team').reset_index(name='Titles')
             
-            fig_titles = px.bar(
-                title_counts,
-                x='Team',
-                y='Titles',
-                template='plotly_dark',
-                color='Titles',
-                color_continuous_scale='YlOrRd',
-            )
-            fig_titles.update_layout(
-                showlegend=False,
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)',
-            )
-            st.plotly_chart(fig_titles, use_container_width=True)
+            st.plotly_chart(build_title_winners_fig(title_counts), use_container_width=True)
     
     with col_f:
         st.subheader("📊 Win Percentage (Top Teams)")
-        team_stats = []
-        for team in teams:
-            team_matches = filtered_matches[
-                (filtered_matches['team1'] == team) | (filtered_matches['team2'] == team)
-            ]
-            wins = filtered_matches[filtered_matches['winner'] == team].shape[0]
-            total = team_matches.shape[0]
-            if total > 0:
-                win_pct = (wins / total) * 100
-                team_stats.append({'Team': team, 'Win %': win_pct, 'Matches': total})
-        
-        team_stats_df = pd.DataFrame(team_stats).sort_values('Win %', ascending=False).head(10)
+        team_stats_df = compute_team_records(filter_key).reset_index().sort_values('Win %', ascending=False).head(10)
         
-        fig_win_pct = px.bar(
-            team_stats_df,
-            x='Win %',
-            y='Team',
-            orientation='h',
-            template='plotly_dark',
-            color='Win %',
-            color_continuous_scale='Greens',
-            hover_data=['Matches'],
-        )
-        fig_win_pct.update_layout(
-            showlegend=False,
-            yaxis={'categoryorder': 'total ascending'},
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
-        )
-        st.plotly_chart(fig_win_pct, use_container_width=True)
+        st.plotly_chart(build_win_pct_fig(team_stats_df), use_container_width=True)
 
 # ============================================================================
 # TAB 2: PLAYER ANALYSIS
@@ -481,51 +1155,15 @@ with tab2:
     
     with col_p1:
         st.subheader("🏏 Top Run Scorers")
-        top_scorers = filtered_deliveries.groupby('batsman')['batsman_runs'].sum().sort_values(ascending=False).head(10).reset_index()
-        top_scorers.columns = ['Batsman', 'Runs']
+        top_scorers = delivery_aggregates['top_scorers']
         
-        fig_scorers = px.bar(
-            top_scorers,
-            x='Runs',
-            y='Batsman',
-            orientation='h',
-            template='plotly_dark',
-            color='Runs',
-            color_continuous_scale='Sunsetdark',
-        )
-        fig_scorers.update_layout(
-            showlegend=False,
-            yaxis={'categoryorder': 'total ascending'},
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
-        )
-        st.plotly_chart(fig_scorers, use_container_width=True)
+        st.plotly_chart(build_top_scorers_fig(top_scorers), use_container_width=True)
         
     with col_p2:
         st.subheader("⚡ Top Wicket Takers")
-        valid_dismissals = get_valid_dismissals()
-        wicket_takers = filtered_deliveries[
-            filtered_deliveries['dismissal_kind'].isin(valid_dismissals)
-        ]
-        top_wicket_takers = wicket_takers['bowler'].value_counts().head(10).reset_index()
-        top_wicket_takers.columns = ['Bowler', 'Wickets']
+        top_wicket_takers = delivery_aggregates['top_wicket_takers']
         
-        fig_wicketers = px.bar(
-            top_wicket_takers,
-            x='Wickets',
-            y='Bowler',
-            orientation='h',
-            template='plotly_dark',
-            color='Wickets',
-            color_continuous_scale='Teal',
-        )
-        fig_wicketers.update_layout(
-            showlegend=False,
-            yaxis={'categoryorder': 'total ascending'},
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
-        )
-        st.plotly_chart(fig_wicketers, use_container_width=True)
+        st.plotly_chart(build_top_wicket_takers_fig(top_wicket_takers), use_container_width=True)
 
     st.divider()
     
@@ -533,47 +1171,15 @@ with tab2:
     
     with col_p3:
         st.subheader("💥 Most Sixes")
-        six_hitters = filtered_deliveries[filtered_deliveries['batsman_runs'] == 6].groupby('batsman').size().sort_values(ascending=False).head(10).reset_index()
-        six_hitters.columns = ['Batsman', 'Sixes']
+        six_hitters = delivery_aggregates['six_hitters']
         
-        fig_sixes = px.bar(
-            six_hitters,
-            x='Sixes',
-            y='Batsman',
-            orientation='h',
-            template='plotly_dark',
-            color='Sixes',
-            color_continuous_scale='Oranges',
-        )
-        fig_sixes.update_layout(
-            showlegend=False,
-            yaxis={'categoryorder': 'total ascending'},
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
-        )
-        st.plotly_chart(fig_sixes, use_container_width=True)
+        st.plotly_chart(build_six_hitters_fig(six_hitters), use_container_width=True)
     
     with col_p4:
         st.subheader("🎯 Most Fours")
-        four_hitters = filtered_deliveries[filtered_deliveries['batsman_runs'] == 4].groupby('batsman').size().sort_values(ascending=False).head(10).reset_index()
-        four_hitters.columns = ['Batsman', 'Fours']
+        four_hitters = delivery_aggregates['four_hitters']
         
-        fig_fours = px.bar(
-            four_hitters,
-            x='Fours',
-            y='Batsman',
-            orientation='h',
-            template='plotly_dark',
-            color='Fours',
-            color_continuous_scale='Blues',
-        )
-        fig_fours.update_layout(
-            showlegend=False,
-            yaxis={'categoryorder': 'total ascending'},
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
-        )
-        st.plotly_chart(fig_fours, use_container_width=True)
+        st.plotly_chart(build_four_hitters_fig(four_hitters), use_container_width=True)
     
     st.divider()
     
@@ -582,7 +1188,8 @@ with tab2:
     
     col_select, col_empty = st.columns([2, 1])
     with col_select:
-        player_list = sorted(filtered_deliveries['batsman'].unique())
+        # Batsmen in the selection, already in name order
+        player_list = delivery_aggregates['batsman_stats'].index.tolist()
         selected_player = st.selectbox(
             "Select a player for detailed statistics",
             player_list,
@@ -590,14 +1197,13 @@ with tab2:
         )
     
     if selected_player:
-        player_df = filtered_deliveries[filtered_deliveries['batsman'] == selected_player]
-        
-        # Calculate stats
-        total_runs = int(player_df['batsman_runs'].sum())
-        innings = int(player_df['match_id'].nunique())
-        balls_faced = int(player_df.shape[0])
-        fours = int(player_df[player_df['batsman_runs'] == 4].shape[0])
-        sixes = int(player_df[player_df['batsman_runs'] == 6].shape[0])
+        # Stats come from the shared per-batsman table
+        player_stats = delivery_aggregates['batsman_stats'].loc[selected_player]
+        total_runs = int(player_stats['runs'])
+        innings = int(player_stats['innings'])
+        balls_faced = int(player_stats['balls'])
+        fours = int(player_stats['fours'])
+        sixes = int(player_stats['sixes'])
         strike_rate = calculate_strike_rate(total_runs, balls_faced)
         avg_per_innings = total_runs / innings if innings > 0 else 0
         
@@ -616,49 +1222,13 @@ with tab2:
         
         with col_chart1:
             # Run distribution
-            run_counts = player_df['batsman_runs'].value_counts().reset_index().sort_values('batsman_runs')
-            run_counts.columns = ['Runs', 'Frequency']
+            run_counts, player_season_runs = compute_player_breakdown(filter_key, selected_player)
             
-            fig_runs_dist = px.bar(
-                run_counts,
-                x='Runs',
-                y='Frequency',
-                title=f"Run Distribution - {selected_player}",
-                template='plotly_dark',
-                color='Frequency',
-                color_continuous_scale='Plasma',
-            )
-            fig_runs_dist.update_layout(
-                showlegend=False,
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)',
-            )
-            st.plotly_chart(fig_runs_dist, use_container_width=True)
+            st.plotly_chart(build_player_runs_dist_fig(run_counts, selected_player), use_container_width=True)
         
         with col_chart2:
             # Runs per season
-            player_season_runs = player_df.merge(
-                filtered_matches[['id', 'season']],
-                left_on='match_id',
-                right_on='id',
-                how='left'
-            ).groupby('season')['batsman_runs'].sum().reset_index()
-            player_season_runs.columns = ['Season', 'Runs']
-            
-            fig_season_runs = px.line(
-                player_season_runs,
-                x='Season',
-                y='Runs',
-                title=f"Runs Per Season - {selected_player}",
-                template='plotly_dark',
-                markers=True,
-            )
-            fig_season_runs.update_traces(line_color='#ff4b4b', marker=dict(size=8))
-            fig_season_runs.update_layout(
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)',
-            )
-            st.plotly_chart(fig_season_runs, use_container_width=True)
+            st.plotly_chart(build_player_season_runs_fig(player_season_runs, selected_player), use_container_width=True)
 
 # ============================================================================
 # TAB 3: VENUE ANALYSIS
@@ -667,25 +1237,7 @@ with tab2:
 with tab3:
     st.subheader("🏟️ Most Hosted Venues")
     
-    venue_matches = filtered_matches['venue'].value_counts().head(15).reset_index()
-    venue_matches.columns = ['Venue', 'Matches']
-    
-    fig_venue = px.bar(
-        venue_matches,
-        x='Matches',
-        y='Venue',
-        orientation='h',
-        template='plotly_dark',
-        color='Matches',
-        color_continuous_scale='Viridis',
-    )
-    fig_venue.update_layout(
-        showlegend=False,
-        yaxis={'categoryorder': 'total ascending'},
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)',
-    )
-    st.plotly_chart(fig_venue, use_container_width=True)
+    st.plotly_chart(filter_figs['venue_matches'], use_container_width=True)
     
     st.divider()
     
@@ -694,29 +1246,7 @@ with tab3:
     with col_v1:
         st.subheader("📊 High Scoring Venues")
         # Average first innings score per venue
-        first_innings = filtered_deliveries[filtered_deliveries['inning'] == 1]
-        match_scores = first_innings.groupby('match_id')['total_runs'].sum().reset_index()
-        match_venue = filtered_matches[['id', 'venue']].rename(columns={'id': 'match_id'})
-        venue_scores = match_scores.merge(match_venue, on='match_id')
-        avg_scores = venue_scores.groupby('venue')['total_runs'].mean().sort_values(ascending=False).head(15).reset_index()
-        avg_scores.columns = ['Venue', 'Avg Score']
-        
-        fig_avg_venue = px.bar(
-            avg_scores,
-            x='Avg Score',
-            y='Venue',
-            orientation='h',
-            template='plotly_dark',
-            color='Avg Score',
-            color_continuous_scale='Reds',
-        )
-        fig_avg_venue.update_layout(
-            showlegend=False,
-            yaxis={'categoryorder': 'total ascending'},
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
-        )
-        st.plotly_chart(fig_avg_venue, use_container_width=True)
+        st.plotly_chart(filter_figs['venue_avg_score'], use_container_width=True)
     
     with col_v2:
         st.subheader("🎯 Winning After Toss")
@@ -731,20 +1261,7 @@ with tab3:
             'Count': [len(toss_win_matches), len(filtered_matches) - len(toss_win_matches)]
         })
         
-        fig_toss_impact = px.pie(
-            toss_impact,
-            names='Outcome',
-            values='Count',
-            template='plotly_dark',
-            color_discrete_sequence=['#2ecc71', '#e74c3c'],
-            hole=0.4,
-        )
-        fig_toss_impact.update_traces(textposition='inside', textinfo='percent+label')
-        fig_toss_impact.update_layout(
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
-        )
-        st.plotly_chart(fig_toss_impact, use_container_width=True)
+        st.plotly_chart(build_toss_impact_fig(toss_impact), use_container_width=True)
         
         st.metric("Toss Advantage", f"{toss_advantage:.1f}%")
 
@@ -755,107 +1272,30 @@ with tab3:
 with tab4:
     st.subheader("📈 Scoring and Wickets by Over")
     
-    # Group by over
-    over_stats = filtered_deliveries.groupby('over').agg({
-        'total_runs': 'sum',
-        'player_dismissed': lambda x: x.notna().sum(),
-        'ball': 'count'
-    }).reset_index()
-    over_stats.columns = ['Over', 'Total Runs', 'Wickets', 'Balls']
-    
-    # Calculate average runs per over
-    over_stats['Avg Runs per Ball'] = over_stats['Total Runs'] / over_stats['Balls']
+    over_stats = delivery_aggregates['over_stats']
     
     col_o1, col_o2 = st.columns(2)
     
     with col_o1:
-        fig_over_runs = px.line(
-            over_stats,
-            x='Over',
-            y='Total Runs',
-            title="Total Runs Scored per Over",
-            markers=True,
-            template='plotly_dark',
-        )
-        fig_over_runs.update_traces(line_color='#ff4b4b', marker=dict(size=6))
-        fig_over_runs.update_layout(
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
-        )
-        st.plotly_chart(fig_over_runs, use_container_width=True)
+        st.plotly_chart(build_over_runs_fig(over_stats), use_container_width=True)
     
     with col_o2:
-        fig_over_wickets = px.bar(
-            over_stats,
-            x='Over',
-            y='Wickets',
-            title="Total Wickets per Over",
-            template='plotly_dark',
-            color='Wickets',
-            color_continuous_scale='Teal',
-        )
-        fig_over_wickets.update_layout(
-            showlegend=False,
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
-        )
-        st.plotly_chart(fig_over_wickets, use_container_width=True)
+        st.plotly_chart(build_over_wickets_fig(over_stats), use_container_width=True)
     
     st.divider()
     
     # Powerplay vs Middle vs Death overs
     st.subheader("⚡ Phase-wise Analysis")
     
-    phase_data = filtered_deliveries.copy()
-    phase_data['Phase'] = phase_data['over'].apply(
-        lambda x: 'Powerplay (1-6)' if x < 6 
-        else ('Middle (7-15)' if x < 15 else 'Death (16-20)')
-    )
-    
-    phase_stats = phase_data.groupby('Phase').agg({
-        'total_runs': 'sum',
-        'player_dismissed': lambda x: x.notna().sum(),
-        'ball': 'count'
-    }).reset_index()
-    
-    phase_stats['Economy'] = (phase_stats['total_runs'] / (phase_stats['ball'] / 6)).round(2)
+    phase_stats = delivery_aggregates['phase_stats']
     
     col_p1, col_p2 = st.columns(2)
     
     with col_p1:
-        fig_phase_runs = px.bar(
-            phase_stats,
-            x='Phase',
-            y='total_runs',
-            title="Runs by Match Phase",
-            template='plotly_dark',
-            color='total_runs',
-            color_continuous_scale='Reds',
-            labels={'total_runs': 'Total Runs'},
-        )
-        fig_phase_runs.update_layout(
-            showlegend=False,
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
-        )
-        st.plotly_chart(fig_phase_runs, use_container_width=True)
+        st.plotly_chart(build_phase_runs_fig(phase_stats), use_container_width=True)
     
     with col_p2:
-        fig_phase_economy = px.bar(
-            phase_stats,
-            x='Phase',
-            y='Economy',
-            title="Economy Rate by Phase",
-            template='plotly_dark',
-            color='Economy',
-            color_continuous_scale='Greens',
-        )
-        fig_phase_economy.update_layout(
-            showlegend=False,
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
-        )
-        st.plotly_chart(fig_phase_economy, use_container_width=True)
+        st.plotly_chart(build_phase_economy_fig(phase_stats), use_container_width=True)
 
 # ============================================================================
 # TAB 5: TEAM COMPARISON
@@ -865,32 +1305,8 @@ with tab5:
     st.subheader("🆚 Head-to-Head Analysis")
     
     # Win matrix
-    pivot_data = []
-    for _, row in filtered_matches.iterrows():
-        winner = row['winner']
-        if pd.notna(winner):
-            loser = row['team2'] if row['team1'] == winner else row['team1']
-            if pd.notna(loser):
-                pivot_data.append({'Winner': winner, 'Loser': loser})
-    
-    if pivot_data:
-        pivot_df = pd.DataFrame(pivot_data)
-        heatmap_data = pd.crosstab(pivot_df['Winner'], pivot_df['Loser'])
-        
-        fig_heat = px.imshow(
-            heatmap_data,
-            text_auto=True,
-            template='plotly_dark',
-            aspect='auto',
-            color_continuous_scale='Viridis',
-            labels={'x': 'Lost Against', 'y': 'Won By', 'color': 'Wins'},
-        )
-        fig_heat.update_layout(
-            title="Team vs Team Win Matrix",
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
-        )
-        st.plotly_chart(fig_heat, use_container_width=True)
+    if filter_figs['h2h_heatmap'] is not None:
+        st.plotly_chart(filter_figs['h2h_heatmap'], use_container_width=True)
     else:
         st.info("📊 Not enough data for head-to-head analysis")
     
@@ -929,21 +1345,7 @@ with tab5:
             'Wins': [team1_wins, team2_wins]
         })
         
-        fig_h2h = px.bar(
-            h2h_data,
-            x='Team',
-            y='Wins',
-            template='plotly_dark',
-            color='Team',
-            color_discrete_sequence=['#ff4b4b', '#0abde3'],
-        )
-        fig_h2h.update_layout(
-            title=f"{team1} vs {team2} - Head to Head",
-            showlegend=False,
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
-        )
-        st.plotly_chart(fig_h2h, use_container_width=True)
+        st.plotly_chart(build_h2h_fig(h2h_data, team1, team2), use_container_width=True)
 
 # ============================================================================
 # TAB 6: ADVANCED STATS
@@ -956,61 +1358,17 @@ with tab6:
     
     with col_a1:
         st.subheader("🏆 Most Consistent Teams")
-        # Teams with best win percentage (min 20 matches)
-        consistency_stats = []
-        for team in teams:
-            team_matches = filtered_matches[
-                (filtered_matches['team1'] == team) | (filtered_matches['team2'] == team)
-            ]
-            if team_matches.shape[0] >= 10:  # Minimum threshold
-                wins = filtered_matches[filtered_matches['winner'] == team].shape[0]
-                total = team_matches.shape[0]
-                win_pct = (wins / total) * 100
-                consistency_stats.append({
-                    'Team': team,
-                    'Win %': win_pct,
-                    'Matches': total,
-                    'Wins': wins
-                })
+        # Teams with best win percentage (min 10 matches)
+        team_records = compute_team_records(filter_key)
+        consistency_df = team_records[team_records['Matches'] >= 10].reset_index().sort_values('Win %', ascending=False).head(10)
         
-        consistency_df = pd.DataFrame(consistency_stats).sort_values('Win %', ascending=False).head(10)
-        
-        fig_consistency = px.scatter(
-            consistency_df,
-            x='Matches',
-            y='Win %',
-            size='Wins',
-            color='Win %',
-            hover_name='Team',
-            template='plotly_dark',
-            color_continuous_scale='RdYlGn',
-            size_max=30,
-        )
-        fig_consistency.update_layout(
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
-        )
-        st.plotly_chart(fig_consistency, use_container_width=True)
+        st.plotly_chart(build_consistency_fig(consistency_df), use_container_width=True)
     
     with col_a2:
         st.subheader("📊 Dismissal Types Distribution")
-        dismissal_counts = filtered_deliveries['dismissal_kind'].value_counts().reset_index()
-        dismissal_counts.columns = ['Dismissal Type', 'Count']
-        dismissal_counts = dismissal_counts[dismissal_counts['Dismissal Type'].notna()]
+        dismissal_counts = compute_dismissal_counts(filter_key)
         
-        fig_dismissals = px.pie(
-            dismissal_counts,
-            names='Dismissal Type',
-            values='Count',
-            template='plotly_dark',
-            hole=0.3,
-        )
-        fig_dismissals.update_traces(textposition='inside', textinfo='percent+label')
-        fig_dismissals.update_layout(
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
-        )
-        st.plotly_chart(fig_dismissals, use_container_width=True)
+        st.plotly_chart(build_dismissals_fig(dismissal_counts), use_container_width=True)
     
     st.divider()
     
@@ -1018,59 +1376,17 @@ with tab6:
     
     with col_a3:
         st.subheader("🎪 Extras Conceded by Type")
-        extras_data = filtered_deliveries[filtered_deliveries['extra_runs'] > 0]
-        
-        # Count different types of extras
-        extras_breakdown = {
-            'Wides': extras_data[extras_data['wide_runs'] > 0].shape[0],
-            'No Balls': extras_data[extras_data['noball_runs'] > 0].shape[0],
-            'Byes': extras_data[extras_data['bye_runs'] > 0].shape[0],
-            'Leg Byes': extras_data[extras_data['legbye_runs'] > 0].shape[0],
-        }
+        # Count deliveries carrying each type of extra in one pass over the four columns
+        extras_cols = ['wide_runs', 'noball_runs', 'bye_runs', 'legbye_runs']
+        extras_counts = (filtered_deliveries[extras_cols].to_numpy() > 0).sum(axis=0)
         
-        extras_df = pd.DataFrame(list(extras_breakdown.items()), columns=['Type', 'Count'])
+        extras_df = pd.DataFrame({'Type': ['Wides', 'No Balls', 'Byes', 'Leg Byes'], 'Count': extras_counts})
         
-        fig_extras = px.bar(
-            extras_df,
-            x='Type',
-            y='Count',
-            template='plotly_dark',
-            color='Count',
-            color_continuous_scale='Reds',
-        )
-        fig_extras.update_layout(
-            showlegend=False,
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
-        )
-        st.plotly_chart(fig_extras, use_container_width=True)
+        st.plotly_chart(build_extras_fig(extras_df), use_container_width=True)
     
     with col_a4:
         st.subheader("📈 Run Rate Progression")
-        # Calculate cumulative run rate by over
-        over_cumulative = filtered_deliveries.groupby('over').agg({
-            'total_runs': 'sum',
-            'ball': 'count'
-        }).reset_index()
-        
-        over_cumulative['Cumulative Runs'] = over_cumulative['total_runs'].cumsum()
-        over_cumulative['Cumulative Balls'] = over_cumulative['ball'].cumsum()
-        over_cumulative['Run Rate'] = (over_cumulative['Cumulative Runs'] / over_cumulative['Cumulative Balls']) * 6
-        
-        fig_run_rate = px.line(
-            over_cumulative,
-            x='over',
-            y='Run Rate',
-            title="Cumulative Run Rate by Over",
-            template='plotly_dark',
-            markers=True,
-        )
-        fig_run_rate.update_traces(line_color='#2ecc71')
-        fig_run_rate.update_layout(
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
-        )
-        st.plotly_chart(fig_run_rate, use_container_width=True)
+        st.plotly_chart(build_run_rate_fig(delivery_aggregates['over_cumulative']), use_container_width=True)
 
 # ============================================================================
 # FOOTER
@@ -0,0 +1,89 @@
+"""
+Column spec for the IPL datasets.
+
+Shared by app.py and scripts/convert_to_parquet.py, so the CSV load and the
+Parquet copies are always built from the same columns and dtypes.
+"""
+
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+from typing import Tuple
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Only the ball-by-ball columns the dashboard uses, with narrow dtypes
+DELIVERY_DTYPES = {
+    'match_id': 'int32', 'inning': 'int8', 'over': 'int8', 'ball': 'int8',
+    'batsman_runs': 'int8', 'extra_runs': 'int8', 'total_runs': 'int8',
+    'wide_runs': 'int8', 'noball_runs': 'int8', 'bye_runs': 'int8', 'legbye_runs': 'int8',
+    'batting_team': 'category', 'bowling_team': 'category',
+    'batsman': 'category', 'bowler': 'category',
+    'dismissal_kind': 'category', 'player_dismissed': 'category',
+}
+
+MATCH_DATE_COLUMNS = ['date']
+
+# Stamped into every Parquet copy. It is derived from the spec above, so any
+# change to the spec marks existing copies as stale.
+SCHEMA_ID = hashlib.sha1(repr((DELIVERY_DTYPES, MATCH_DATE_COLUMNS)).encode()).hexdigest()[:12]
+SCHEMA_KEY = b'ipl_dashboard_schema'
+
+# Process umask, read once at import: mkstemp creates files as 0600, and the
+# Parquet copies should get the same permissions as any other new file
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def read_csv_data(data_dir: Path) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Parse matches.csv and deliveries.csv with the shared column spec.
+
+    Returns:
+        Tuple of (matches, deliveries) DataFrames
+    """
+    matches = pd.read_csv(data_dir / "matches.csv", parse_dates=MATCH_DATE_COLUMNS, engine='pyarrow')
+    deliveries = pd.read_csv(
+        data_dir / "deliveries.csv", usecols=list(DELIVERY_DTYPES), dtype=DELIVERY_DTYPES, engine='pyarrow'
+    )
+    return matches, deliveries
+
+
+def write_parquet(df: pd.DataFrame, path: Path) -> None:
+    """
+    Write a DataFrame to Parquet, stamped with the current SCHEMA_ID.
+
+    The file is written to a temporary file in the same directory and then
+    renamed over `path`, so an interrupted write never leaves a partial copy.
+    """
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    metadata = {**(table.schema.metadata or {}), SCHEMA_KEY: SCHEMA_ID.encode()}
+
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    os.close(fd)
+    try:
+        pq.write_table(table.replace_schema_metadata(metadata), tmp_path)
+        os.chmod(tmp_path, 0o666 & ~_UMASK)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def parquet_is_current(path: Path, csv_path: Path) -> bool:
+    """
+    Whether `path` is a usable Parquet copy of `csv_path`.
+
+    The copy must be readable, written under the current SCHEMA_ID and no
+    older than the CSV, so an edited or replaced CSV is picked up again.
+    """
+    try:
+        metadata = pq.read_schema(path).metadata or {}
+        if csv_path.exists() and path.stat().st_mtime < csv_path.stat().st_mtime:
+            return False
+    except (OSError, pa.ArrowException):
+        return False
+    return metadata.get(SCHEMA_KEY) == SCHEMA_ID.encode()
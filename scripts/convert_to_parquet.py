@@ -0,0 +1,33 @@
+"""
+One-shot conversion of the IPL CSV datasets to Parquet.
+
+The dashboard reads data/matches.parquet and data/deliveries.parquet when
+they were written under the current column spec (see data_schema.py) and
+falls back to the CSVs otherwise. Run from the project root:
+
+    python scripts/convert_to_parquet.py
+"""
+
+import sys
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+DATA_DIR = PROJECT_DIR / "data"
+
+sys.path.insert(0, str(PROJECT_DIR))
+
+from data_schema import read_csv_data, write_parquet  # noqa: E402
+
+
+def main() -> None:
+    """Convert matches.csv and deliveries.csv to Parquet next to the originals."""
+    matches, deliveries = read_csv_data(DATA_DIR)
+
+    for name, df in [("matches", matches), ("deliveries", deliveries)]:
+        path = DATA_DIR / f"{name}.parquet"
+        write_parquet(df, path)
+        print(f"✅ Wrote {path} ({len(df):,} rows)")
+
+
+if __name__ == "__main__":
+    main()